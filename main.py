@@ -1,11 +1,25 @@
-import os, json, logging, requests, smtplib
-from typing import List, Dict, Any
+import os, math, time, hashlib, logging, asyncio, functools, inspect, operator, socket, threading, requests, smtplib
+import aiofiles
+import httpx
+from anyio import to_thread
+import orjson
+import numpy as np
+from cachetools import LRUCache, TTLCache
+from contextlib import asynccontextmanager, suppress
+from datetime import date as Date
+from urllib.parse import urlsplit
+from uuid import uuid4
+from typing import List, Dict, Any, NamedTuple, Optional, Sequence
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from fastapi import FastAPI, Request, HTTPException, Header
-from pydantic import BaseModel, EmailStr, ValidationError
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, EmailStr, TypeAdapter, ValidationError
 from dotenv import load_dotenv
 from openai import OpenAI
+from tenacity import retry, retry_if_exception, stop_after_attempt, stop_before_delay, wait_exponential_jitter
 
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -14,14 +28,273 @@ SMTP_USER = os.getenv("SMTP_USER")
 SMTP_PASS = os.getenv("SMTP_PASS")
 SMTP_HOST = os.getenv("SMTP_HOST", "smtp.example.com")
 SMTP_PORT = int(os.getenv("SMTP_PORT", 465))
+SMTP_MAX_MESSAGES_PER_CONN = int(os.getenv("SMTP_MAX_MESSAGES_PER_CONN", 100))
 MCP_API_KEY = os.getenv("MCP_API_KEY")
-NEWS_API_URL = "https://newsapi.org/v2/everything"
+NEWS_API_BASE_URL = "https://newsapi.org"
+NEWS_API_PATH = "/v2/everything"
+NEWS_API_URL = NEWS_API_BASE_URL + NEWS_API_PATH
+REDIS_URL = os.getenv("REDIS_URL")
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", 3600))
+NEWS_CACHE_TTL = int(os.getenv("NEWS_CACHE_TTL", 300))
+SUMMARY_MODEL = "gpt-4o-mini"
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIM = 1536
+SEMANTIC_CACHE_PATH = os.getenv("SEMANTIC_CACHE_PATH", "semantic_cache.npz")
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", 0.95))
+SEMANTIC_CACHE_MAX_CHARS = 20000
+SEMANTIC_CACHE_MAX_SIZE = int(os.getenv("SEMANTIC_CACHE_MAX_SIZE", 1024))
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_AFTER_MAX = 60
+NEWS_FETCH_DEADLINE = 45
+NEWS_SEM = asyncio.Semaphore(int(os.getenv("NEWS_API_CONCURRENCY", 8)))
+OPENAI_SEM = threading.BoundedSemaphore(int(os.getenv("OPENAI_CONCURRENCY", 16)))
+WORKER_THREADS = int(os.getenv("WORKER_THREADS", 64))
+SUMMARY_BATCH_SIZE = int(os.getenv("SUMMARY_BATCH_SIZE", 50))
+SUMMARY_QUEUE_SIZE = 4
+SUMMARY_SYSTEM_PROMPT = (
+    "You are a helpful assistant. "
+    "Summarize each news item in 2-3 sentences. "
+    "Only return the HTML snippets for each news item, "
+    "without adding <html>, <head>, or <body> tags. "
+    "Use this format:\n"
+    "<h2>Title</h2>\n"
+    "<p><b>Date:</b> YYYY-MM-DD</p>\n"
+    "<p><b>Summary:</b> ...</p>\n"
+    "<p><a href='link'>Read More</a></p>\n"
+    "<hr>\n"
+)
+SUMMARY_SYSTEM_MSG = {"role": "system", "content": SUMMARY_SYSTEM_PROMPT}
+NEWS_BASE_PARAMS = {"language": "en"}
+ARTICLE_TEMPLATE = "Title: {}\nDate: {}\nContent: {}\nLink: {}".format
 
 if not MCP_API_KEY:
     raise RuntimeError("MCP_API_KEY not set in .env")
 
 client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
-app = FastAPI(title="MCP Server for News Tools")
+
+if REDIS_URL:
+    import redis
+    redis_client = redis.Redis.from_url(REDIS_URL, decode_responses=True)
+else:
+    redis_client = None
+
+_LLM_CACHE = TTLCache(maxsize=1024, ttl=LLM_CACHE_TTL)
+_LLM_CACHE_LOCK = threading.Lock()
+
+class NewsCacheEntry(NamedTuple):
+    expires: float
+    etag: Optional[str]
+    articles: List[Dict[str, Any]]
+
+_NEWS_CACHE = LRUCache(maxsize=512)
+_NEWS_CACHE_LOCK = threading.Lock()
+
+class SemanticCache:
+    def __init__(self, path: str, threshold: float, max_size: int, ttl: float, dim: int):
+        self.path = path
+        self.dim = dim
+        self.threshold = threshold
+        self.max_size = max_size
+        self.ttl = ttl
+        self._vectors = None
+        self._stored = np.zeros(max_size, dtype=np.float64)
+        self._summaries: List[Optional[str]] = [None] * max_size
+        self._count = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def _insert(self, vector: np.ndarray, summary: str, stored: float):
+        if self._vectors is None:
+            self._vectors = np.zeros((self.max_size, self.dim), dtype=np.float32)
+        i = self._next
+        self._vectors[i] = vector
+        self._stored[i] = stored
+        self._summaries[i] = summary
+        self._next = (i + 1) % self.max_size
+        self._count = min(self._count + 1, self.max_size)
+
+    def _read(self):
+        with np.load(self.path) as data:
+            vectors, stored, summaries = data["vectors"], data["stored"], data["summaries"].tolist()
+        if vectors.ndim != 2 or vectors.shape[1] != self.dim:
+            raise ValueError(f"expected {self.dim}-dim vectors, got shape {vectors.shape}")
+        if not len(vectors) == len(stored) == len(summaries):
+            raise ValueError("vectors, timestamps and summaries differ in length")
+        return vectors, stored, summaries
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            vectors, stored, summaries = self._read()
+        except Exception as e:
+            logger.warning("Ignoring unreadable semantic cache %s: %s", self.path, e)
+            return
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            for i in np.argsort(stored):
+                if stored[i] >= cutoff:
+                    self._insert(vectors[i], summaries[i], float(stored[i]))
+
+    def save(self):
+        with self._lock:
+            n = self._count
+            if not n:
+                return
+            tmp = f"{self.path}.{uuid4().hex}.tmp"
+            try:
+                with open(tmp, "wb") as f:
+                    np.savez(
+                        f,
+                        vectors=self._vectors[:n],
+                        stored=self._stored[:n],
+                        summaries=np.array(self._summaries[:n]),
+                    )
+                os.replace(tmp, self.path)
+            except BaseException:
+                with suppress(FileNotFoundError):
+                    os.unlink(tmp)
+                raise
+
+    def lookup(self, vector: np.ndarray):
+        with self._lock:
+            n = self._count
+            if not n:
+                return None
+            scores = self._vectors[:n] @ vector
+            scores[self._stored[:n] < time.time() - self.ttl] = -np.inf
+            best = int(np.argmax(scores))
+            if scores[best] >= self.threshold:
+                return self._summaries[best]
+        return None
+
+    def add(self, vector: np.ndarray, summary: str):
+        with self._lock:
+            self._insert(vector, summary, time.time())
+
+SEMANTIC_CACHE = SemanticCache(SEMANTIC_CACHE_PATH, SEMANTIC_CACHE_THRESHOLD, SEMANTIC_CACHE_MAX_SIZE, LLM_CACHE_TTL, EMBEDDING_DIM)
+
+NEWS_API_HEADERS = {"Authorization": f"Bearer {NEWS_API_KEY}"}
+
+SESSION = requests.Session()
+SESSION.headers.update(NEWS_API_HEADERS)
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=RETRY_STATUSES,
+        respect_retry_after_header=False,
+    ),
+))
+
+class SMTPPool:
+    def __init__(self, host: str, port: int, user: str, password: str, max_messages: int = 100):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.max_messages = max_messages
+        self._server = None
+        self._sent = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        self._close()
+        server = smtplib.SMTP_SSL(self.host, self.port)
+        server.login(self.user, self.password)
+        self._server = server
+        self._sent = 0
+
+    def _close(self):
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except (smtplib.SMTPException, socket.error):
+            pass
+        self._server = None
+
+    def _healthy(self) -> bool:
+        if self._server is None or self._sent >= self.max_messages:
+            return False
+        try:
+            return self._server.noop()[0] == 250
+        except (smtplib.SMTPServerDisconnected, socket.error):
+            return False
+
+    def warm(self):
+        with self._lock:
+            if self._healthy():
+                return
+            try:
+                self._connect()
+            except (smtplib.SMTPException, socket.error) as e:
+                logger.warning("SMTP warm-up failed: %s", e)
+
+    def _sendmail(self, from_addr: str, to_addrs: List[str], msg: str):
+        server = self._server
+        if len(to_addrs) < 2 or not server.has_extn("pipelining"):
+            return server.sendmail(from_addr, to_addrs, msg)
+
+        server.putcmd("mail", f"FROM:{smtplib.quoteaddr(from_addr)}")
+        for addr in to_addrs:
+            server.putcmd("rcpt", f"TO:{smtplib.quoteaddr(addr)}")
+        code, resp = server.getreply()
+        refused = {}
+        for addr in to_addrs:
+            rcpt_code, rcpt_resp = server.getreply()
+            if rcpt_code not in (250, 251):
+                refused[addr] = (rcpt_code, rcpt_resp)
+        if code != 250:
+            server.rset()
+            raise smtplib.SMTPSenderRefused(code, resp, from_addr)
+        if len(refused) == len(to_addrs):
+            server.rset()
+            raise smtplib.SMTPRecipientsRefused(refused)
+        code, resp = server.data(msg)
+        if code != 250:
+            server.rset()
+            raise smtplib.SMTPDataError(code, resp)
+        return refused
+
+    def send(self, from_addr: str, to_addrs: List[str], msg: str):
+        with self._lock:
+            if not self._healthy():
+                self._connect()
+            try:
+                refused = self._sendmail(from_addr, to_addrs, msg)
+            except (smtplib.SMTPServerDisconnected, socket.error):
+                logger.warning("SMTP connection dropped, reconnecting")
+                self._connect()
+                refused = self._sendmail(from_addr, to_addrs, msg)
+            self._sent += 1
+            return refused
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+POOL = SMTPPool(SMTP_HOST, SMTP_PORT, SMTP_USER, SMTP_PASS, SMTP_MAX_MESSAGES_PER_CONN)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    to_thread.current_default_thread_limiter().total_tokens = WORKER_THREADS
+    SEMANTIC_CACHE.load()
+    app.state.http = httpx.AsyncClient(
+        base_url=NEWS_API_BASE_URL,
+        headers=NEWS_API_HEADERS,
+        timeout=10.0,
+        limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100),
+    )
+    yield
+    await app.state.http.aclose()
+    SESSION.close()
+    POOL.close()
+    SEMANTIC_CACHE.save()
+
+app = FastAPI(title="MCP Server for News Tools", lifespan=lifespan, default_response_class=ORJSONResponse)
 logger = logging.getLogger("uvicorn")
 
 class FetchNewsParams(BaseModel):
@@ -33,6 +306,7 @@ class SendEmailParams(BaseModel):
     to_email: EmailStr
     subject: str
     body: str
+    bcc: List[EmailStr] = []
 
 class SummarizeParams(BaseModel):
     articles: List[Dict[str, Any]]
@@ -45,78 +319,274 @@ class SmartNewsEmailParams(BaseModel):
     date: str
     email: EmailStr
     topics: List[TopicCount]
+    bcc: List[EmailStr] = []
+
+def _news_cache_key(params: Dict[str, Any]) -> str:
+    return hashlib.sha256(orjson.dumps(params, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+def _news_cache_get(key: str) -> Optional[NewsCacheEntry]:
+    with _NEWS_CACHE_LOCK:
+        return _NEWS_CACHE.get(key)
+
+def _news_ttl(date: str) -> float:
+    try:
+        day = Date.fromisoformat(date)
+    except ValueError:
+        return NEWS_CACHE_TTL
+    return math.inf if day < Date.today() else NEWS_CACHE_TTL
+
+def _revalidation_headers(entry: Optional[NewsCacheEntry]):
+    if entry and entry.etag:
+        return {"If-None-Match": entry.etag}
+    return None
+
+def _news_response(key: str, date: str, r, entry: Optional[NewsCacheEntry]):
+    if r.status_code == 304 and entry:
+        articles, etag = entry.articles, entry.etag
+    else:
+        r.raise_for_status()
+        articles, etag = orjson.loads(r.content).get("articles", []), r.headers.get("ETag")
+    with _NEWS_CACHE_LOCK:
+        _NEWS_CACHE[key] = NewsCacheEntry(time.monotonic() + _news_ttl(date), etag, articles)
+    return articles
 
 def fetch_news_impl(topic: str, date: str, count: int = 5):
-    r = requests.get(
-        NEWS_API_URL,
-        params={"q": topic, "apiKey": NEWS_API_KEY, "pageSize": count, "language": "en", "from": date, "to": date},
-        timeout=10,
+    params = NEWS_BASE_PARAMS | {"q": topic, "pageSize": count, "from": date, "to": date}
+    key = _news_cache_key(params)
+    entry = _news_cache_get(key)
+    if entry and entry.expires > time.monotonic():
+        return entry.articles
+    r = SESSION.get(NEWS_API_URL, params=params, headers=_revalidation_headers(entry), timeout=10)
+    return _news_response(key, date, r, entry)
+
+def _is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in RETRY_STATUSES
+    return isinstance(exc, httpx.TimeoutException)
+
+_backoff = wait_exponential_jitter(multiplier=0.5, max=8)
+
+def _wait_retry_after(retry_state) -> float:
+    exc = retry_state.outcome.exception()
+    if isinstance(exc, httpx.HTTPStatusError):
+        retry_after = exc.response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), RETRY_AFTER_MAX)
+    return _backoff(retry_state)
+
+@retry(
+    wait=_wait_retry_after,
+    stop=stop_after_attempt(5) | stop_before_delay(NEWS_FETCH_DEADLINE),
+    retry=retry_if_exception(_is_retryable),
+    reraise=True,
+)
+async def fetch_news_async(topic: str, date: str, count: int = 5):
+    params = NEWS_BASE_PARAMS | {"q": topic, "pageSize": count, "from": date, "to": date}
+    key = _news_cache_key(params)
+    entry = _news_cache_get(key)
+    if entry and entry.expires > time.monotonic():
+        return entry.articles
+    async with NEWS_SEM:
+        r = await app.state.http.get(NEWS_API_PATH, params=params, headers=_revalidation_headers(entry))
+    return _news_response(key, date, r, entry)
+
+def _llm_cache_key(news_text: str) -> str:
+    payload = orjson.dumps(
+        {"model": SUMMARY_MODEL, "system": SUMMARY_SYSTEM_PROMPT, "user": news_text},
+        option=orjson.OPT_SORT_KEYS,
     )
-    r.raise_for_status()
-    return r.json().get("articles", [])
+    return hashlib.sha256(payload).hexdigest()
+
+def _llm_cache_get(key: str):
+    with _LLM_CACHE_LOCK:
+        cached = _LLM_CACHE.get(key)
+    if cached is None and redis_client:
+        try:
+            cached = redis_client.get(f"llm:{key}")
+        except redis.RedisError as e:
+            logger.warning("Redis get failed: %s", e)
+        if cached is not None:
+            with _LLM_CACHE_LOCK:
+                _LLM_CACHE[key] = cached
+    return cached
+
+def _llm_cache_set(key: str, summary: str):
+    with _LLM_CACHE_LOCK:
+        _LLM_CACHE[key] = summary
+    if redis_client:
+        try:
+            redis_client.set(f"llm:{key}", summary, ex=LLM_CACHE_TTL)
+        except redis.RedisError as e:
+            logger.warning("Redis set failed: %s", e)
+
+def _embed(text: str):
+    if len(text) > SEMANTIC_CACHE_MAX_CHARS:
+        return None
+    try:
+        with OPENAI_SEM:
+            resp = client.embeddings.create(model=EMBEDDING_MODEL, input=text)
+    except Exception as e:
+        logger.warning("Embedding failed, skipping semantic cache: %s", e)
+        return None
+    vector = np.asarray(resp.data[0].embedding, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+def _stream_summary(news_text: str):
+    with OPENAI_SEM:
+        stream = client.chat.completions.create(
+            model=SUMMARY_MODEL,
+            messages=(SUMMARY_SYSTEM_MSG, {"role": "user", "content": news_text}),
+            temperature=0,
+            stream=True,
+        )
+        for chunk in stream:
+            if chunk.choices:
+                yield chunk.choices[0].delta.content or ""
+
+def _llm_summarize(news_text: str) -> str:
+    key = _llm_cache_key(news_text)
+    cached = _llm_cache_get(key)
+    if cached is not None:
+        return cached
+
+    vector = _embed(news_text)
+    if vector is not None:
+        cached = SEMANTIC_CACHE.lookup(vector)
+        if cached is not None:
+            _llm_cache_set(key, cached)
+            return cached
+
+    summary = "".join(_stream_summary(news_text)).strip()
+    _llm_cache_set(key, summary)
+    if vector is not None:
+        SEMANTIC_CACHE.add(vector, summary)
+    return summary
 
 def summarize_articles_impl(articles: List[Dict[str, Any]]) -> str:
     if not articles:
         return "<p>No news found for the selected topics/date.</p>"
 
-    news_text = "\n\n".join(
-        f"Title: {a.get('title')}\nDate: {a.get('publishedAt')}\nContent: {a.get('content')}\nLink: {a.get('url')}"
-        for a in articles
-    )
+    titles = [a.get("title") or "" for a in articles]
+    dates = [a.get("publishedAt") or "" for a in articles]
+    contents = [a.get("content") or "" for a in articles]
+    urls = [a.get("url") or "" for a in articles]
+    news_text = "\n\n".join(map(ARTICLE_TEMPLATE, titles, dates, contents, urls))
 
     if not client:
         return "OpenAI API key missing"
 
-    prompt = [
-        {"role": "system",
-         "content": (
-             "You are a helpful assistant. "
-             "Summarize each news item in 2-3 sentences. "
-             "Only return the HTML snippets for each news item, "
-             "without adding <html>, <head>, or <body> tags. "
-             "Use this format:\n"
-             "<h2>Title</h2>\n"
-             "<p><b>Date:</b> YYYY-MM-DD</p>\n"
-             "<p><b>Summary:</b> ...</p>\n"
-             "<p><a href='link'>Read More</a></p>\n"
-             "<hr>\n"
-         )
-         },
-        {"role": "user", "content": news_text}
-    ]
-
-    resp = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=prompt
-    )
+    return _llm_summarize(news_text)
 
-    return resp.choices[0].message.content.strip()
-
-def send_email_impl(to_email: str, subject: str, body: str):
-    server = smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT)
-    server.login(SMTP_USER, SMTP_PASS)
+def send_email_impl(to_email: str, subject: str, body: str, bcc: Sequence[str] = ()):
     msg = MIMEMultipart()
     msg["From"] = SMTP_USER
     msg["To"] = to_email
     msg["Subject"] = subject
     msg.attach(MIMEText(body, "html"))
-    server.sendmail(SMTP_USER, to_email, msg.as_string())
-    server.quit()
-    return {"sent": True}
+    refused = POOL.send(SMTP_USER, [to_email, *bcc], msg.as_string())
+    return {"sent": True, "refused": list(refused)}
+
+def _article_key(article: Dict[str, Any]):
+    url = article.get("url")
+    if not url:
+        return None
+    parts = urlsplit(url)
+    return parts.netloc.lower(), parts.path.rstrip("/")
+
+def _dedup_articles(articles: List[Dict[str, Any]], seen: set) -> List[Dict[str, Any]]:
+    deduped = []
+    for a in articles:
+        key = _article_key(a)
+        if key is not None:
+            if key in seen:
+                continue
+            seen.add(key)
+        deduped.append(a)
+    return deduped
+
+def _is_client_error(exc: BaseException) -> bool:
+    return (
+        isinstance(exc, httpx.HTTPStatusError)
+        and 400 <= exc.response.status_code < 500
+        and not _is_retryable(exc)
+    )
+
+async def _produce_articles(index: int, topic: TopicCount, date: str, queue: asyncio.Queue):
+    try:
+        articles = await fetch_news_async(topic=topic.topic, date=date, count=topic.count)
+    except Exception as e:
+        logger.warning("fetch_news failed for topic %r: %s", topic.topic, e)
+        articles = e
+    await queue.put((index, articles))
 
-def smart_news_email_impl(date: str, email: str, topics: List[Dict[str, Any]]):
-    all_articles = []
-    for t in topics:
-        articles = fetch_news_impl(topic=t["topic"], date=date, count=t.get("count", 5))
-        all_articles.extend(articles)
+async def _gather_summaries(tasks: List[asyncio.Future]) -> List[str]:
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
 
-    summary_html = summarize_articles_impl(all_articles)
+async def _consume_articles(queue: asyncio.Queue, producers: int) -> List[str]:
+    batch_size = SUMMARY_BATCH_SIZE if client else math.inf
+    seen = set()
+    pending = {}
+    next_index = 0
+    batch = []
+    tasks = []
+    errors = []
+    fatal = None
+    for _ in range(producers):
+        index, articles = await queue.get()
+        if fatal is None and _is_client_error(articles):
+            fatal = articles
+        pending[index] = articles
+        while fatal is None and next_index in pending:
+            articles = pending.pop(next_index)
+            next_index += 1
+            if isinstance(articles, Exception):
+                errors.append(articles)
+                continue
+            for a in _dedup_articles(articles, seen):
+                batch.append(a)
+                if len(batch) >= batch_size:
+                    tasks.append(asyncio.ensure_future(to_thread.run_sync(summarize_articles_impl, batch)))
+                    batch = []
+
+    if fatal is None and errors and len(errors) == producers:
+        fatal = errors[0]
+    if fatal is not None:
+        # Worker threads cannot be interrupted: summaries already started run to
+        # completion (and are billed and cached) before the error is returned.
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise fatal
+
+    if batch or not tasks:
+        tasks.append(asyncio.ensure_future(to_thread.run_sync(summarize_articles_impl, batch)))
+    return await _gather_summaries(tasks)
+
+async def smart_news_email_impl(date: str, email: str, topics: List[TopicCount], bcc: Sequence[str] = ()):
+    queue = asyncio.Queue(maxsize=SUMMARY_QUEUE_SIZE)
+    *_, summaries, _ = await asyncio.gather(
+        *[_produce_articles(i, t, date, queue) for i, t in enumerate(topics)],
+        _consume_articles(queue, len(topics)),
+        to_thread.run_sync(POOL.warm),
+    )
+    summary_html = "\n".join(summaries)
 
     filename = f"news_summary_{date}.html"
-    with open(filename, "w", encoding="utf-8") as f:
-        f.write(summary_html)
+    tmp = f"{filename}.{uuid4().hex}.tmp"
+    try:
+        async with aiofiles.open(tmp, "w", encoding="utf-8") as f:
+            await f.write(summary_html)
+        await to_thread.run_sync(os.replace, tmp, filename)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            await to_thread.run_sync(os.unlink, tmp)
+        raise
 
-    send_email_impl(to_email=email, subject=f"Daily News Summary - {date}", body=summary_html)
+    await to_thread.run_sync(functools.partial(
+        send_email_impl, to_email=email, subject=f"Daily News Summary - {date}", body=summary_html, bcc=bcc,
+    ))
     return {"status": "success", "file": filename}
 
 
@@ -134,11 +604,27 @@ TOOLS_MODELS = {
     "smart_news_email": SmartNewsEmailParams,
 }
 
+TOOLS_ADAPTERS = {name: TypeAdapter(model) for name, model in TOOLS_MODELS.items()}
+
+def _make_dispatcher(fn, model):
+    if list(model.model_fields) != list(inspect.signature(fn).parameters):
+        raise TypeError(f"{model.__name__} fields do not match {fn.__name__} parameters")
+    fields = operator.attrgetter(*model.model_fields)
+    if len(model.model_fields) == 1:
+        call = lambda m: fn(fields(m))
+    else:
+        call = lambda m: fn(*fields(m))
+    if inspect.iscoroutinefunction(fn):
+        return call
+    return lambda m: to_thread.run_sync(call, m)
+
+TOOLS_DISPATCH = {name: _make_dispatcher(TOOLS_IMPL[name], model) for name, model in TOOLS_MODELS.items()}
+
 TOOLS_METADATA = {
-    "fetch_news": {"name": "fetch_news", "description": "Fetch news articles", "params_schema": FetchNewsParams.schema()},
-    "summarize_articles": {"name": "summarize_articles", "description": "Summarize articles with OpenAI", "params_schema": SummarizeParams.schema()},
-    "send_email": {"name": "send_email", "description": "Send HTML email via SMTP", "params_schema": SendEmailParams.schema()},
-    "smart_news_email": {"name": "smart_news_email", "description": "Fetch multiple topics, summarize, save HTML, and send email", "params_schema": SmartNewsEmailParams.schema()},
+    "fetch_news": {"name": "fetch_news", "description": "Fetch news articles", "params_schema": FetchNewsParams.model_json_schema()},
+    "summarize_articles": {"name": "summarize_articles", "description": "Summarize articles with OpenAI", "params_schema": SummarizeParams.model_json_schema()},
+    "send_email": {"name": "send_email", "description": "Send HTML email via SMTP", "params_schema": SendEmailParams.model_json_schema()},
+    "smart_news_email": {"name": "smart_news_email", "description": "Fetch multiple topics, summarize, save HTML, and send email", "params_schema": SmartNewsEmailParams.model_json_schema()},
 }
 
 def check_api_key(x_mcp_api_key: str):
@@ -153,7 +639,7 @@ async def get_registry(x_mcp_api_key: str = Header(None)):
 @app.post("/jsonrpc")
 async def handle_jsonrpc(request: Request, x_mcp_api_key: str = Header(None)):
     check_api_key(x_mcp_api_key)
-    payload = await request.json()
+    payload = orjson.loads(await request.body())
     req_id = payload.get("id")
     method = payload.get("method")
     params = payload.get("params", {})
@@ -163,10 +649,10 @@ async def handle_jsonrpc(request: Request, x_mcp_api_key: str = Header(None)):
     if tool_name not in TOOLS_IMPL:
         return {"jsonrpc": "2.0", "id": req_id, "error": {"code": -32601, "message": "Tool not found"}}
     try:
-        model = TOOLS_MODELS[tool_name](**params)
-        result = TOOLS_IMPL[tool_name](**model.dict())
+        model = TOOLS_ADAPTERS[tool_name].validate_python(params)
+        result = await TOOLS_DISPATCH[tool_name](model)
         return {"jsonrpc": "2.0", "id": req_id, "result": result}
     except ValidationError as e:
-        return {"jsonrpc": "2.0", "id": req_id, "error": {"code": -32602, "message": "Invalid params", "data": json.loads(e.json())}}
+        return {"jsonrpc": "2.0", "id": req_id, "error": {"code": -32602, "message": "Invalid params", "data": orjson.loads(e.json())}}
     except Exception as e:
         return {"jsonrpc": "2.0", "id": req_id, "error": {"code": -32000, "message": "Server error", "data": str(e)}}
@@ -1,14 +1,15 @@
-import os, requests
+import os, httpx
 from dotenv import load_dotenv
 
 load_dotenv()
 MCP_URL = "http://localhost:8000/jsonrpc"
 MCP_KEY = os.getenv("MCP_API_KEY")
 HEADERS = {"Content-Type": "application/json", "X-MCP-API-KEY": MCP_KEY}
+HTTP = httpx.Client(headers=HEADERS, timeout=120)
 
 def call_tool(method, params, req_id=1):
     payload = {"jsonrpc": "2.0", "id": req_id, "method": f"tool.{method}", "params": params}
-    r = requests.post(MCP_URL, json=payload, headers=HEADERS, timeout=120)
+    r = HTTP.post(MCP_URL, json=payload)
     r.raise_for_status()
     return r.json().get("result")
 